@@ -18,6 +18,13 @@ class AssetType(Enum):
     SHORT_RANGE_RADAR = "SHORT_RANGE_RADAR"
 
 
+class AssetCategory(Enum):
+    BASE = "base"
+    OFFENSIVE = "offensive"
+    DEFENSIVE = "defensive"
+    SCOUT = "scout"
+
+
 @dataclass
 class AssetDefinition:
     type: AssetType
@@ -26,6 +33,7 @@ class AssetDefinition:
     is_mobile: bool
     speed: int
     range: int
+    category: AssetCategory
 
 
 @dataclass
@@ -59,8 +67,13 @@ class Asset:
         """Whether this asset is currently visible to the opponent"""
         return False  # TODO: Implement based on scouting mechanics
 
-    def can_move_to(self, new_pos: Tuple[int, int]) -> bool:
-        """Check if asset can move to the given position"""
+    def can_move_to(self, new_pos: Tuple[int, int], distances=None) -> bool:
+        """Check if asset can move to the given position
+
+        Args:
+            new_pos: (row, col) target position
+            distances: Optional precomputed distance table indexed as [row1, col1, row2, col2]
+        """
         if not self.definition.is_mobile:
             return False
 
@@ -69,7 +82,10 @@ class Asset:
 
         x1, y1 = self.position
         x2, y2 = new_pos
-        manhattan_dist = abs(x2 - x1) + abs(y2 - y1)
+        if distances is not None:
+            manhattan_dist = distances[x1, y1, x2, y2]
+        else:
+            manhattan_dist = abs(x2 - x1) + abs(y2 - y1)
 
         return manhattan_dist <= self.definition.speed
 
@@ -93,5 +109,6 @@ def load_asset_definitions() -> Dict[AssetType, AssetDefinition]:
                 is_mobile=row["IsMobile"].lower() == "true",
                 speed=int(row["Speed"]),
                 range=int(row["Range"]),
+                category=AssetCategory(row["Type"]),
             )
     return assets
@@ -0,0 +1,213 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Callable, Deque, List, Optional
+
+import numpy as np
+
+# Signature of a batched policy: (observations (batch, features), num_actions) -> logits (batch, num_actions)
+BatchedPolicyFn = Callable[[np.ndarray, int], np.ndarray]
+
+
+class MLPPolicyNetwork:
+    """Small NumPy MLP standing in for a trained policy network.
+
+    The action space grows with the number of mobile assets, so action ids are hashed onto a fixed
+    number of output units.
+    """
+
+    def __init__(self, input_size: int, hidden_size: int = 64, num_outputs: int = 1024, seed: int = 0):
+        rng = np.random.default_rng(seed)
+        self.w1 = rng.normal(0, 1 / np.sqrt(input_size), (input_size, hidden_size)).astype(np.float32)
+        self.b1 = np.zeros(hidden_size, dtype=np.float32)
+        self.w2 = rng.normal(0, 1 / np.sqrt(hidden_size), (hidden_size, num_outputs)).astype(np.float32)
+        self.b2 = np.zeros(num_outputs, dtype=np.float32)
+
+    def __call__(self, observations: np.ndarray, num_actions: int) -> np.ndarray:
+        hidden = np.maximum(observations @ self.w1 + self.b1, 0)
+        logits = hidden @ self.w2 + self.b2
+        return logits[:, np.arange(num_actions) % logits.shape[1]]
+
+
+@dataclass
+class BrokerMetrics:
+    """Batch-fill and queue-latency statistics of an InferenceBroker"""
+
+    max_batch_size: int
+    batches: int = 0
+    requests: int = 0
+    queue_latencies: Deque[float] = field(default_factory=lambda: deque(maxlen=10000))  # Seconds, most recent
+
+    @property
+    def mean_batch_size(self) -> float:
+        return self.requests / self.batches if self.batches else 0.0
+
+    @property
+    def mean_batch_fill(self) -> float:
+        """Average fraction of max_batch_size used per batch"""
+        return self.mean_batch_size / self.max_batch_size
+
+    @property
+    def mean_queue_latency(self) -> float:
+        return float(np.mean(self.queue_latencies)) if self.queue_latencies else 0.0
+
+    @property
+    def p95_queue_latency(self) -> float:
+        return float(np.percentile(self.queue_latencies, 95)) if self.queue_latencies else 0.0
+
+
+@dataclass
+class _Request:
+    observation: np.ndarray
+    mask: np.ndarray
+    submitted: float
+    future: Future
+
+
+class InferenceBroker:
+    """Collects action requests from many games and evaluates them in batches.
+
+    A batch is evaluated once max_batch_size requests are queued or the oldest request has waited
+    max_latency seconds, whichever comes first. Each waiting game receives its chosen action
+    through a Future.
+    """
+
+    def __init__(
+        self,
+        policy_fn: BatchedPolicyFn,
+        max_batch_size: int = 64,
+        max_latency: float = 0.005,
+        temperature: float = 0.0,
+        seed: int = 0,
+    ):
+        """
+        Args:
+            policy_fn: Batched policy evaluated on stacked observations
+            max_batch_size: Largest batch evaluated at once
+            max_latency: Longest a request waits for its batch to fill, in seconds
+            temperature: 0 picks the best legal action, otherwise actions are sampled
+            seed: Seed for action sampling
+        """
+        self.policy_fn = policy_fn
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency
+        self.temperature = temperature
+        self.metrics = BrokerMetrics(max_batch_size)
+
+        self._rng = np.random.default_rng(seed)
+        self._queue: Deque[_Request] = deque()
+        self._condition = threading.Condition()
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "InferenceBroker":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        """Start the serving thread, doing nothing if it is already running"""
+        with self._condition:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._running = True
+            self._thread = threading.Thread(target=self._serve, name="inference-broker", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        with self._condition:
+            self._running = False
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def submit(self, observation: np.ndarray, mask: np.ndarray) -> Future:
+        """Queue one observation and legal-action mask, resolving to the chosen action id"""
+        request = _Request(observation, mask, time.monotonic(), Future())
+        with self._condition:
+            if not self._running:
+                raise RuntimeError("InferenceBroker is not running")
+            self._queue.append(request)
+            if len(self._queue) >= self.max_batch_size:
+                self._condition.notify()
+            elif len(self._queue) == 1:
+                self._condition.notify()  # Start the latency deadline
+        return request.future
+
+    def _next_batch(self) -> List[_Request]:
+        """Block until a batch is due, returning an empty list when stopping"""
+        with self._condition:
+            while self._running and not self._queue:
+                self._condition.wait()
+
+            deadline = self._queue[0].submitted + self.max_latency if self._queue else 0
+            while self._running and len(self._queue) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+
+            batch_size = min(len(self._queue), self.max_batch_size)
+            return [self._queue.popleft() for _ in range(batch_size)]
+
+    def _serve(self) -> None:
+        try:
+            while True:
+                requests = self._next_batch()
+                if not requests:
+                    if not self._running:
+                        return
+                    continue
+
+                # Claim each request, dropping those whose caller has already cancelled it
+                batch = [request for request in requests if request.future.set_running_or_notify_cancel()]
+                if batch:
+                    self._dispatch(batch)
+        finally:
+            # However serving ends, refuse new work and fail anything still queued instead of leaving it hanging
+            with self._condition:
+                self._running = False
+                stranded = list(self._queue)
+                self._queue.clear()
+            for request in stranded:
+                if request.future.set_running_or_notify_cancel():
+                    request.future.set_exception(RuntimeError("InferenceBroker stopped"))
+
+    def _dispatch(self, batch: List[_Request]) -> None:
+        """Evaluate a batch of claimed requests and resolve their Futures"""
+        try:
+            actions = self._evaluate(batch)
+
+            dispatched = time.monotonic()
+            self.metrics.batches += 1
+            self.metrics.requests += len(batch)
+            self.metrics.queue_latencies.extend(dispatched - request.submitted for request in batch)
+        except Exception as exc:  # noqa: BLE001  Hand the failure to every waiting game
+            for request in batch:
+                request.future.set_exception(exc)
+            return
+
+        for request, action in zip(batch, actions):
+            request.future.set_result(int(action))
+
+    def _evaluate(self, batch: List[_Request]) -> np.ndarray:
+        """Run the policy once over the batch and pick a legal action per request"""
+        observations = np.stack([request.observation for request in batch])
+
+        # Masks differ in length, so pad them to the widest one
+        num_actions = max(request.mask.size for request in batch)
+        masks = np.zeros((len(batch), num_actions), dtype=bool)
+        for row, request in enumerate(batch):
+            masks[row, : request.mask.size] = request.mask
+
+        logits = self.policy_fn(observations, num_actions).astype(np.float64)
+        if self.temperature > 0:
+            # Gumbel-max trick samples from softmax(logits / temperature)
+            logits = logits / self.temperature + self._rng.gumbel(size=logits.shape)
+        logits[~masks] = -np.inf
+        return np.argmax(logits, axis=1)
@@ -0,0 +1,263 @@
+import argparse
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional
+
+import pyspiel
+
+import icbm_game  # noqa: F401  Registers the game with pyspiel
+
+_MAX_STEPS = 500
+_TURN_COST = 5
+
+
+@dataclass
+class Divergence:
+    """First point where the reference and optimized engines disagree"""
+
+    step: int
+    message: str
+
+
+@dataclass
+class FuzzResult:
+    """Outcome of one lock-step game"""
+
+    actions: List[int] = field(default_factory=list)  # Actions applied, in order
+    steps: int = 0
+    divergence: Optional[Divergence] = None
+
+
+def snapshot(state) -> Dict[str, object]:
+    """Comparable description of everything the engines are expected to agree on"""
+    asset_ids = {
+        id(asset): (player, idx) for player in range(2) for idx, asset in enumerate(state._deployed_assets[player])
+    }
+
+    result = {
+        "game_phase": state.game_phase,
+        "current_player": state._current_player,
+        "board": state._board.tolist(),
+    }
+    for player in range(2):
+        result[f"player{player}"] = (
+            state._players_points[player],
+            state._victory_points[player],
+            state._has_citadel[player],
+            [asset.definition.type.value for asset in state._purchased_assets[player]],
+            [
+                (asset.definition.type.value, asset.position, asset.is_active, asset.is_destroyed)
+                for asset in state._deployed_assets[player]
+            ],
+        )
+        result[f"visible{player}"] = sorted(asset_ids[id(asset)] for asset in state._visible_assets[player])
+    return result
+
+
+def _advance(state) -> None:
+    """Apply the transitions the driver makes between player actions"""
+    if state.game_phase != "DEPLOYMENT":
+        return
+
+    if state.is_deployment_done(0) and state.is_deployment_done(1):
+        # Initial reveal starts the game phase with player 0 to move
+        if state._current_player == 1:
+            state.switch_player()
+        state.reveal_visible_enemy_assets()
+        state.game_phase = "BATTLE"
+    elif state.is_deployment_done(state._current_player):
+        state.switch_player()
+
+
+def _step(state, action: Optional[int]) -> None:
+    """Apply one action, or a pass when a battle-phase player has no legal moves"""
+    if state.game_phase == "DEPLOYMENT":
+        state.apply_action(action)
+        return
+
+    if action is not None:
+        state.execute_turn_movements([action])
+        state.reveal_visible_enemy_assets()
+        state._victory_points[state._current_player] -= _TURN_COST
+    state.switch_player()
+
+
+def _is_terminal(state) -> bool:
+    return state.game_phase != "DEPLOYMENT" and min(state._victory_points) <= 0
+
+
+def _run(fn, state, *args):
+    """Call fn, capturing any exception so both engines can be compared on it"""
+    try:
+        return "ok", fn(state, *args)
+    except Exception as exc:  # noqa: BLE001  Any crash is a fuzzing failure
+        return "error", f"{type(exc).__name__}: {exc}"
+
+
+def _legal_actions(state) -> List[int]:
+    return sorted(state._legal_actions(state._current_player))
+
+
+def _describe(what: str, reference, fast) -> str:
+    return f"{what}\n  reference: {reference}\n  fast:      {fast}"
+
+
+def _compare_states(reference, fast, what: str) -> Optional[str]:
+    """Describe the first snapshot field the two states disagree on, if any"""
+    reference_snapshot, fast_snapshot = snapshot(reference), snapshot(fast)
+    for key in reference_snapshot:
+        if reference_snapshot[key] != fast_snapshot[key]:
+            return _describe(f"{key} differs {what}", reference_snapshot[key], fast_snapshot[key])
+    return None
+
+
+class Fuzzer:
+    """Plays random games through the reference and optimized engines in lock-step"""
+
+    def __init__(self, max_steps: int = _MAX_STEPS):
+        self.max_steps = max_steps
+        self.reference_game = pyspiel.load_game("icbm_game", {"reference_mode": True})
+        self.fast_game = pyspiel.load_game("icbm_game")
+
+    def run(self, choose: Callable[[List[int]], Optional[int]]) -> FuzzResult:
+        """Drive both engines with actions picked by choose(legal_actions) until the game ends
+
+        choose may return None to stop early.
+        """
+        reference = self.reference_game.new_initial_state()
+        fast = self.fast_game.new_initial_state()
+        result = FuzzResult()
+
+        while result.steps < self.max_steps and not _is_terminal(reference):
+            result.steps += 1
+            step = result.steps
+
+            outcomes = [_run(_advance, state) for state in (reference, fast)]
+            if "error" in (outcomes[0][0], outcomes[1][0]):
+                message = _describe("phase transition raised", outcomes[0][1], outcomes[1][1])
+                result.divergence = Divergence(step, message)
+                return result
+
+            message = _compare_states(reference, fast, "after phase transition")
+            if message is not None:
+                result.divergence = Divergence(step, message)
+                return result
+
+            legal = [_run(_legal_actions, state) for state in (reference, fast)]
+            if "error" in (legal[0][0], legal[1][0]) or legal[0] != legal[1]:
+                result.divergence = Divergence(step, _describe("legal actions differ", legal[0][1], legal[1][1]))
+                return result
+
+            legal_actions = legal[0][1]
+            if legal_actions:
+                action = choose(legal_actions)
+                if action is None:
+                    break
+                result.actions.append(action)
+            elif reference.game_phase == "DEPLOYMENT":
+                break  # Deployment dead-ended in both engines
+            else:
+                action = None
+
+            outcomes = [_run(_step, state, action) for state in (reference, fast)]
+            if "error" in (outcomes[0][0], outcomes[1][0]):
+                message = _describe(f"action {action} raised", outcomes[0][1], outcomes[1][1])
+                result.divergence = Divergence(step, message)
+                return result
+
+            message = _compare_states(reference, fast, f"after action {action}")
+            if message is not None:
+                result.divergence = Divergence(step, message)
+                return result
+
+        return result
+
+    def play(self, seed: int) -> FuzzResult:
+        """Play one random game"""
+        rng = random.Random(seed)
+        return self.run(rng.choice)
+
+    def replay(self, actions: List[int]) -> FuzzResult:
+        """Replay an action sequence, skipping actions that are not legal where they come up"""
+        remaining: Iterator[int] = iter(actions)
+
+        def choose(legal_actions: List[int]) -> Optional[int]:
+            legal = set(legal_actions)
+            return next((action for action in remaining if action in legal), None)
+
+        return self.run(choose)
+
+    def shrink(self, actions: List[int]) -> List[int]:
+        """Reduce a failing action sequence to a minimal one that still diverges"""
+        return shrink_actions(actions, lambda candidate: self.replay(candidate).divergence is not None)
+
+
+def shrink_actions(actions: List[int], fails: Callable[[List[int]], bool]) -> List[int]:
+    """Delta-debugging style reduction: drop chunks of actions while the sequence still fails"""
+    chunk = max(len(actions) // 2, 1)
+    while actions:
+        removed = False
+        start = 0
+        while start < len(actions):
+            candidate = actions[:start] + actions[start + chunk :]
+            if fails(candidate):
+                actions = candidate
+                removed = True
+            else:
+                start += chunk
+
+        if chunk == 1 and not removed:
+            break
+        if not removed:
+            chunk = max(chunk // 2, 1)
+
+    return actions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Differential fuzzing of the optimized engine against the reference rules"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the first game, later games use seed + n")
+    parser.add_argument("--games", type=int, default=100, help="Number of games to play, 0 for no limit")
+    parser.add_argument("--duration", type=float, default=0, help="Stop after this many seconds, 0 for no limit")
+    parser.add_argument("--max-steps", type=int, default=_MAX_STEPS, help="Maximum actions per game")
+    parser.add_argument("--report-interval", type=float, default=30, help="Seconds between throughput reports")
+    args = parser.parse_args()
+
+    fuzzer = Fuzzer(max_steps=args.max_steps)
+    start = last_report = time.monotonic()
+    games = steps = 0
+
+    def report(prefix: str) -> None:
+        elapsed = max(time.monotonic() - start, 1e-9)
+        print(
+            f"{prefix}: {games} games, {steps} steps in {elapsed:.1f}s "
+            f"({games / elapsed:.2f} games/s, {steps / elapsed:.1f} steps/s)"
+        )
+
+    while (args.games == 0 or games < args.games) and (args.duration == 0 or time.monotonic() - start < args.duration):
+        seed = args.seed + games
+        result = fuzzer.play(seed)
+        games += 1
+        steps += result.steps
+
+        if result.divergence is not None:
+            print(f"Divergence in game with seed {seed} at step {result.divergence.step}: {result.divergence.message}")
+            minimal = fuzzer.shrink(result.actions)
+            print(f"Minimal reproducer ({len(minimal)} of {len(result.actions)} actions): {minimal}")
+            print(fuzzer.replay(minimal).divergence.message)
+            report("Failed")
+            return 1
+
+        if time.monotonic() - last_report >= args.report_interval:
+            last_report = time.monotonic()
+            report("Progress")
+
+    report("Done")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
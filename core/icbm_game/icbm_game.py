@@ -2,7 +2,8 @@ import numpy as np
 from typing import List, Dict, Optional, Tuple
 
 import pyspiel
-from asset import AssetType, Asset, load_asset_definitions
+from asset import AssetType, Asset, AssetDefinition, load_asset_definitions
+from spatial import HeatLayer, HeatMaps, build_distance_table, layer_radius
 from dataclasses import dataclass
 from enum import Enum
 
@@ -11,6 +12,7 @@ _NUM_ROWS = 10
 _NUM_COLS = 20
 _STARTING_POINTS = 125
 _VICTORY_POINTS = 100
+_LAUNCH_SITE_ID = list(AssetType).index(AssetType.LAUNCH_SITE) + 1  # Board encoding of a launch site
 
 
 class GamePhase(Enum):
@@ -21,6 +23,35 @@ class GamePhase(Enum):
     SCOUTING = "SCOUTING"
 
 
+def _build_budget_reachability(assets: Dict[AssetType, AssetDefinition], max_points: int) -> np.ndarray:
+    """Precompute which remaining budgets can still be spent down to exactly 0.
+
+    Deployment only finishes once a player has exactly 0 points left, so a purchase that leaves
+    an unspendable remainder dead-ends the phase. Mobile assets can only be bought once a launch
+    site is deployed, so reachability depends on that as well.
+
+    Returns:
+        Boolean array indexed as [has_launch_site, remaining_points]
+    """
+    reachable = np.zeros((2, max_points + 1), dtype=bool)
+    reachable[:, 0] = True
+
+    for points in range(1, max_points + 1):
+        for has_launch_site in (False, True):
+            for asset_type, asset_def in assets.items():
+                if asset_def.cost == 0 or asset_def.cost > points:
+                    continue
+                if asset_def.is_mobile and not has_launch_site:
+                    continue
+
+                next_has_launch_site = has_launch_site or asset_type == AssetType.LAUNCH_SITE
+                if reachable[int(next_has_launch_site), points - asset_def.cost]:
+                    reachable[int(has_launch_site), points] = True
+                    break
+
+    return reachable
+
+
 class ICBMGame(pyspiel.Game):
     """A two-player zero-sum game representing ICBM warfare."""
 
@@ -38,6 +69,13 @@ class ICBMGame(pyspiel.Game):
         )
         super().__init__(_GAME_TYPE, game_info, params or {})
 
+        # Reference mode runs the original pure-Python rules instead of the optimized paths
+        self.reference_mode = bool(self.get_parameters().get("reference_mode", False))
+
+        # Budgets from which deployment can still finish, shared by every state of this game
+        self.budget_reachability = _build_budget_reachability(load_asset_definitions(), _STARTING_POINTS)
+        self.distance_table = build_distance_table(_NUM_ROWS, _NUM_COLS)
+
     def new_initial_state(self):
         """Returns a new ICBMState."""
         return ICBMState(self)
@@ -84,6 +122,8 @@ class ICBMState(pyspiel.State):
         self._deployed_assets = {0: [], 1: []}  # Assets on the board
         self._has_citadel = {0: False, 1: False}  # Track if citadel deployed
         self.assets = load_asset_definitions()
+        self._budget_reachability = game.budget_reachability
+        self._reference_mode = game.reference_mode
 
         # Board representation
         self._board = np.zeros((_NUM_ROWS, _NUM_COLS), dtype=int)
@@ -91,6 +131,19 @@ class ICBMState(pyspiel.State):
         # Visibility tracking
         self._visible_assets = {0: set(), 1: set()}  # Assets visible to each player
 
+        # Distance lookups and per-player threat/coverage heatmaps
+        self._distances = game.distance_table
+        self._heatmaps = HeatMaps(self._distances, _NUM_PLAYERS)
+
+        # Incremental scouting: reverse indexes between scouts and the enemy assets they currently see,
+        # plus the assets that moved or were launched since the last reveal
+        self._assets_at: Dict[Tuple[int, int], set] = {}  # Position -> deployed assets there
+        self._scouts = {0: set(), 1: set()}  # Assets currently able to see, per player
+        self._observers: Dict[Asset, set] = {}  # Asset -> enemy scouts currently seeing it
+        self._sightings: Dict[Asset, set] = {}  # Scout -> enemy assets it currently sees
+        self._visibility_changes: Dict[Asset, None] = {}  # Ordered set of assets to recheck
+        self._visibility_initialized = False
+
         # Turn tracking
         self._turn_number = 0
         self._policies_this_turn = []  # List of moves to resolve
@@ -129,6 +182,27 @@ class ICBMState(pyspiel.State):
 
     def can_deploy(self, player: int, asset: Asset, position: Tuple[int, int]) -> bool:
         """Check if asset can be deployed to position"""
+        if self._reference_mode:
+            return self._can_deploy_reference(player, asset, position)
+
+        row, col = position
+        player_area = self.get_player_area(player)
+
+        # Check if position is in player's area
+        if not (player_area[0].start <= row < player_area[0].stop and player_area[1].start <= col < player_area[1].stop):
+            return False
+
+        # The board holds every static asset, and only this player's can sit inside their area
+        board_val = self._board[row, col]
+        if asset.definition.is_mobile:
+            # Mobile assets must be deployed to launch sites
+            return board_val == player * 100 + _LAUNCH_SITE_ID
+
+        # Static assets can't be co-located
+        return board_val == 0
+
+    def _can_deploy_reference(self, player: int, asset: Asset, position: Tuple[int, int]) -> bool:
+        """Reference implementation of can_deploy"""
         row, col = position
         player_area = self.get_player_area(player)
 
@@ -158,6 +232,28 @@ class ICBMState(pyspiel.State):
 
     def apply_action(self, action_id: int) -> None:
         """Apply specified action."""
+        # Only deployment has a fast path so far, other phases share the reference handling
+        if self._reference_mode or self.game_phase != "DEPLOYMENT":
+            return self._apply_action_reference(action_id)
+
+        row_slice, col_slice = self.get_player_area(self._current_player)
+        area_cols = col_slice.stop - col_slice.start
+        positions_per_asset = (row_slice.stop - row_slice.start) * area_cols
+
+        asset_type_idx, position_idx = divmod(action_id, positions_per_asset)
+        purchasable_assets = self._purchasable_asset_types(self._current_player)
+        if asset_type_idx >= len(purchasable_assets):
+            return  # Invalid action
+
+        row_offset, col_offset = divmod(position_idx, area_cols)
+        position = (row_slice.start + row_offset, col_slice.start + col_offset)
+
+        # Purchase and deploy
+        if self.purchase_asset(self._current_player, purchasable_assets[asset_type_idx]):
+            self.deploy_asset(self._current_player, -1, position)
+
+    def _apply_action_reference(self, action_id: int) -> None:
+        """Reference implementation of apply_action"""
         if self.game_phase != "DEPLOYMENT":
             return  # TODO: Implement game phase actions
 
@@ -168,19 +264,7 @@ class ICBMState(pyspiel.State):
         positions_per_asset = len(rows) * len(cols)
 
         # First, build list of purchasable assets in order
-        has_launch_site = any(
-            asset.definition.type == AssetType.LAUNCH_SITE for asset in self._deployed_assets[self._current_player]
-        )
-
-        purchasable_assets = []
-        for asset_type in AssetType:
-            asset_def = self.assets[asset_type]
-            if asset_type == AssetType.CITADEL and self._has_citadel[self._current_player]:
-                continue
-            if asset_def.is_mobile and not has_launch_site and asset_type != AssetType.LAUNCH_SITE:
-                continue
-            if self.can_purchase(self._current_player, asset_type):
-                purchasable_assets.append(asset_type)
+        purchasable_assets = self._purchasable_asset_types(self._current_player)
 
         # Determine which asset type and position
         asset_type_idx = action_id // positions_per_asset
@@ -200,6 +284,36 @@ class ICBMState(pyspiel.State):
         if self.purchase_asset(self._current_player, asset_type):
             self.deploy_asset(self._current_player, -1, (row, col))
 
+    def _purchasable_asset_types(self, player: int) -> List[AssetType]:
+        """Asset types the player can buy next, in the order used to encode deployment actions"""
+        # Check if player has a launch site so we can prevent purchase of mobile assets unil we have a place to deploy them
+        has_launch_site = any(asset.definition.type == AssetType.LAUNCH_SITE for asset in self._deployed_assets[player])
+
+        purchasable_assets = []
+        for asset_type in AssetType:
+            asset_def = self.assets[asset_type]
+
+            # Skip citadel if player already has one
+            if asset_type == AssetType.CITADEL and self._has_citadel[player]:
+                continue
+
+            # Skip mobile assets if no launch site (except the launch site itself)
+            if asset_def.is_mobile and not has_launch_site and asset_type != AssetType.LAUNCH_SITE:
+                continue
+
+            if not self.can_purchase(player, asset_type):
+                continue
+
+            # Skip purchases that leave a remainder which can never be spent down to exactly 0
+            next_has_launch_site = has_launch_site or asset_type == AssetType.LAUNCH_SITE
+            remaining_points = self._players_points[player] - asset_def.cost
+            if not self._budget_reachability[int(next_has_launch_site), remaining_points]:
+                continue
+
+            purchasable_assets.append(asset_type)
+
+        return purchasable_assets
+
     def deploy_asset(self, player: int, asset_idx: int, position: Tuple[int, int]) -> bool:
         """Deploy a purchased asset to the board
 
@@ -231,8 +345,34 @@ class ICBMState(pyspiel.State):
         if asset.definition.type == AssetType.CITADEL:
             self._has_citadel[player] = True
 
+        self._assets_at.setdefault(position, set()).add(asset)
+        self._heatmaps.update(asset)
+        self._update_scout(asset)
+
         return True
 
+    def destroy_asset(self, asset: Asset) -> None:
+        """Remove a deployed asset from play"""
+        asset.is_destroyed = True
+        self._destroyed_assets.add(asset)
+
+        if asset.position is not None:
+            self._assets_at[asset.position].discard(asset)
+            if not asset.definition.is_mobile:
+                row, col = asset.position
+                self._board[row, col] = 0
+
+        self._heatmaps.update(asset)
+        self._update_scout(asset)
+        self._invalidate_visibility(asset)
+
+    def heatmap(self, layer: HeatLayer, player: int) -> np.ndarray:
+        """Read-only (rows, cols) counts of the given player's assets covering each cell on a layer
+
+        Bots looking for danger should query the opponent, e.g. heatmap(HeatLayer.THREAT, 1 - player)
+        """
+        return self._heatmaps.heatmap(layer, player)
+
     def get_static_asset_at_position(self, position: Tuple[int, int]) -> Optional[Tuple[int, AssetType]]:
         """Get the player ID and asset type of static asset at a position
 
@@ -257,6 +397,33 @@ class ICBMState(pyspiel.State):
                     assets.append(asset)
         return assets
 
+    def observation_planes(self, player: int) -> np.ndarray:
+        """Encode the board from a player's perspective
+
+        Returns:
+            Array of shape (2 * len(AssetType) + len(HeatLayer), rows, cols) holding counts of the
+            player's own assets per type, counts of the enemy assets currently visible to the player,
+            then the player's own heatmaps
+        """
+        asset_types = list(AssetType)
+        planes = np.zeros((2 * len(asset_types) + len(HeatLayer), _NUM_ROWS, _NUM_COLS), dtype=np.float32)
+
+        for asset in self._deployed_assets[player]:
+            if asset.is_destroyed or asset.position is None:
+                continue
+            row, col = asset.position
+            planes[asset_types.index(asset.definition.type), row, col] += 1
+
+        for asset in self._visible_assets[player]:
+            if asset.is_destroyed or asset.position is None:
+                continue
+            row, col = asset.position
+            planes[len(asset_types) + asset_types.index(asset.definition.type), row, col] += 1
+
+        planes[2 * len(asset_types) :] = self._heatmaps.stacked(player)
+
+        return planes
+
     def is_deployment_done(self, player: int) -> bool:
         """Check if player has finished deployment"""
         return self._has_citadel[player] and len(self._purchased_assets[player]) == 0 and self._players_points[player] == 0
@@ -269,42 +436,74 @@ class ICBMState(pyspiel.State):
             return self._legal_deployments(player)
 
     def _legal_deployments(self, player: int) -> List[int]:
+        if self._reference_mode:
+            return self._legal_deployments_reference(player)
+
+        player_area = self.get_player_area(player)
+        area = self._board[player_area].ravel()
+        positions_per_asset = area.size
+
+        # Static assets go on empty cells, mobile assets onto the player's launch sites
+        free_positions = np.flatnonzero(area == 0)
+        launch_site_positions = np.flatnonzero(area == player * 100 + _LAUNCH_SITE_ID)
+
+        actions = []
+        for asset_type_idx, asset_type in enumerate(self._purchasable_asset_types(player)):
+            positions = launch_site_positions if self.assets[asset_type].is_mobile else free_positions
+            actions.extend((asset_type_idx * positions_per_asset + positions).tolist())
+
+        return actions
+
+    def _legal_deployments_reference(self, player: int) -> List[int]:
+        """Reference implementation of _legal_deployments"""
         actions = []
         action_id = 0
         player_area = self.get_player_area(player)
         rows = range(player_area[0].start, player_area[0].stop)
         cols = range(player_area[1].start, player_area[1].stop)
 
-        # Check if player has a launch site so we can prevent purchase of mobile assets unil we have a place to deploy them
-        has_launch_site = any(asset.definition.type == AssetType.LAUNCH_SITE for asset in self._deployed_assets[player])
-
         # Check deployments for each purchasable asset type
-        for asset_type in AssetType:
-            asset_def = self.assets[asset_type]
+        for asset_type in self._purchasable_asset_types(player):
+            # Create temporary asset for position checking
+            temp_asset = Asset(definition=self.assets[asset_type], player=player)
+
+            # Check each possible position
+            # TODO: For efficiency, only check positions of launch sites for mobile assets
+            for row in range(rows.start, rows.stop):
+                for col in range(cols.start, cols.stop):
+                    if self.can_deploy(player, temp_asset, (row, col)):
+                        actions.append(action_id)
+                    action_id += 1
 
-            # Skip citadel if player already has one
-            if asset_type == AssetType.CITADEL and self._has_citadel[player]:
-                continue
+        return actions
 
-            # Skip mobile assets if no launch site (except the launch site itself)
-            if asset_def.is_mobile and not has_launch_site and asset_type != AssetType.LAUNCH_SITE:
+    def _legal_movements(self, player: int) -> List[int]:
+        if self._reference_mode:
+            return self._legal_movements_reference(player)
+
+        actions = []
+        # Get all mobile assets for this player
+        mobile_assets = [
+            asset for asset in self._deployed_assets[player] if asset.definition.is_mobile and not asset.is_destroyed
+        ]
+
+        # For each mobile asset, find all possible moves within its speed range
+        for asset_idx, asset in enumerate(mobile_assets):
+            if not asset.position:  # Skip if asset has no position
                 continue
 
-            if self.can_purchase(player, asset_type):
-                # Create temporary asset for position checking
-                temp_asset = Asset(definition=self.assets[asset_type], player=player)
+            current_x, current_y = asset.position
+            speed = asset.definition.speed
 
-                # Check each possible position
-                # TODO: For efficiency, only check positions of launch sites for mobile assets
-                for row in range(rows.start, rows.stop):
-                    for col in range(cols.start, cols.stop):
-                        if self.can_deploy(player, temp_asset, (row, col)):
-                            actions.append(action_id)
-                        action_id += 1
+            # Convert to action ID:
+            # action_id = asset_index * (total_board_positions) + position_index
+            position_indices = np.flatnonzero(self._distances[current_x, current_y] <= speed)
+            actions.extend((asset_idx * (_NUM_ROWS * _NUM_COLS) + position_indices).tolist())
 
         return actions
 
-    def _legal_movements(self, player: int) -> List[int]:
+    def _legal_movements_reference(self, player: int) -> List[int]:
+        """Reference implementation of _legal_movements"""
         actions = []
         # Get all mobile assets for this player
         mobile_assets = [
@@ -321,7 +520,7 @@ class ICBMState(pyspiel.State):
 
             # Check all positions within manhattan distance of speed
             for dx in range(-speed, speed + 1):
-                for dy in range(-speed - abs(dx), speed - abs(dx) + 1):
+                for dy in range(-(speed - abs(dx)), speed - abs(dx) + 1):
                     new_x = current_x + dx
                     new_y = current_y + dy
 
@@ -370,16 +569,21 @@ class ICBMState(pyspiel.State):
         asset = mobile_assets[asset_idx]
 
         # Check if movement is valid
-        if not asset.can_move_to(target_pos):
+        if not asset.can_move_to(target_pos, self._distances):
             return False
 
-        # Update asset position
+        # Update asset position, moving a mobile asset launches it
+        self._assets_at[asset.position].discard(asset)
         asset.position = target_pos
+        asset.is_active = True
+        self._assets_at.setdefault(target_pos, set()).add(asset)
 
-        # Remove from visible assets since it moved
-        for player in range(self._players_points):
-            if asset in self._visible_assets[player]:
-                self._visible_assets[player].remove(asset)
+        self._heatmaps.update(asset)
+        self._update_scout(asset)
+
+        # Seen assets stay visible until they move, so drop it and recheck at the next reveal
+        self._invalidate_visibility(asset)
+        self._visibility_changes[asset] = None
 
         return True
 
@@ -395,6 +599,117 @@ class ICBMState(pyspiel.State):
         # Clear pending movements after processing
         self._pending_movements = []
 
+    def _update_scout(self, asset: Asset) -> None:
+        """Track whether an asset can currently see, mobile scouts only once launched"""
+        if layer_radius(asset, HeatLayer.COVERAGE) is None:
+            self._scouts[asset.player].discard(asset)
+        else:
+            self._scouts[asset.player].add(asset)
+
+    def _invalidate_visibility(self, asset: Asset) -> None:
+        """Drop every scout/target pair involving an asset that moved or was destroyed"""
+        self._visible_assets[1 - asset.player].discard(asset)
+
+        for scout in self._observers.pop(asset, ()):
+            self._sightings[scout].discard(asset)
+
+        # Assets this scout saw stay visible, they just lose it as an observer
+        for target in self._sightings.pop(asset, ()):
+            self._observers[target].discard(asset)
+
+    def _add_sighting(self, scout: Asset, target: Asset) -> None:
+        self._sightings.setdefault(scout, set()).add(target)
+        self._observers.setdefault(target, set()).add(scout)
+        self._visible_assets[scout.player].add(target)
+
+    def _scan_from_scout(self, scout: Asset) -> None:
+        """Record every enemy asset inside a scout's visibility range"""
+        row, col = scout.position
+        radius = layer_radius(scout, HeatLayer.COVERAGE)
+        for position in np.argwhere(self._distances[row, col] <= radius).tolist():
+            for target in self._assets_at.get(tuple(position), ()):
+                if target.player != scout.player:
+                    self._add_sighting(scout, target)
+
+    def _scan_for_target(self, target: Asset) -> None:
+        """Record every enemy scout that can see an asset"""
+        enemy_player = 1 - target.player
+        row, col = target.position
+        if not self._heatmaps.heatmap(HeatLayer.COVERAGE, enemy_player)[row, col]:
+            return
+
+        for scout in self._scouts[enemy_player]:
+            scout_row, scout_col = scout.position
+            if self._distances[scout_row, scout_col, row, col] <= layer_radius(scout, HeatLayer.COVERAGE):
+                self._add_sighting(scout, target)
+
+    def reveal_visible_enemy_assets(self) -> None:
+        """Reveal any enemy assets that are visible to each player
+
+        Scouts are assets with a visibility range, mobile ones only once launched. Seen assets stay
+        visible until they move or are destroyed. The first reveal, or any during deployment, scans
+        every scout; later ones only recheck assets that moved since the previous reveal.
+        """
+        if self._reference_mode:
+            return self._reveal_visible_enemy_assets_reference()
+
+        if self.game_phase == "DEPLOYMENT" or not self._visibility_initialized:
+            self._visible_assets[0].clear()
+            self._visible_assets[1].clear()
+            self._observers.clear()
+            self._sightings.clear()
+            self._visibility_changes.clear()
+            self._visibility_initialized = True
+
+            for player in range(_NUM_PLAYERS):
+                for scout in self._scouts[player]:
+                    self._scan_from_scout(scout)
+            return
+
+        for asset in self._visibility_changes:
+            if asset.is_destroyed:
+                continue
+            self._scan_for_target(asset)
+            if asset in self._scouts[asset.player]:
+                self._scan_from_scout(asset)
+        self._visibility_changes.clear()
+
+    def _reveal_visible_enemy_assets_reference(self) -> None:
+        """Reference implementation of reveal_visible_enemy_assets"""
+        if self.game_phase == "DEPLOYMENT":
+            # Clear all visibility data
+            self._visible_assets[0].clear()
+            self._visible_assets[1].clear()
+
+        # Process for first player (0), then second player (1)
+        for current_player in range(_NUM_PLAYERS):
+            enemy_player = 1 - current_player  # If current is 0, enemy is 1 and vice versa
+
+            # Get current player's scouting assets, mobile ones only once launched
+            scout_assets = [
+                asset
+                for asset in self._deployed_assets[current_player]
+                if not asset.is_destroyed
+                and asset.definition.visibility_range > 0
+                and (asset.is_active or not asset.definition.is_mobile)
+            ]
+
+            # Check what each scout can see
+            for scout in scout_assets:
+                scout_x, scout_y = scout.position
+                visibility_range = scout.definition.visibility_range
+
+                # Check against all enemy assets
+                for enemy_asset in self._deployed_assets[enemy_player]:
+                    if enemy_asset.is_destroyed or not enemy_asset.position:
+                        continue
+
+                    enemy_x, enemy_y = enemy_asset.position
+                    distance = abs(enemy_x - scout_x) + abs(enemy_y - scout_y)
+
+                    if distance <= visibility_range:
+                        self._visible_assets[current_player].add(enemy_asset)
+
 
 # Define game type
 _GAME_TYPE = pyspiel.GameType(
@@ -411,7 +726,7 @@ _GAME_TYPE = pyspiel.GameType(
     provides_information_state_tensor=True,
     provides_observation_string=True,
     provides_observation_tensor=True,
-    parameter_specification={},
+    parameter_specification={"reference_mode": False},
 )
 
 # Game registration
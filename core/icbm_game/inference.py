@@ -0,0 +1,69 @@
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+import numpy as np
+
+from broker import InferenceBroker, MLPPolicyNetwork
+from play_game import ICBMGameDriver
+from policy import Policy
+
+
+class BrokeredPolicy(Policy):
+    """Policy that asks a shared InferenceBroker for its actions.
+
+    Holds a reference to a running broker, so use it with games on threads rather than processes.
+    """
+
+    name = "brokered"
+
+    def __init__(self, broker: InferenceBroker):
+        self._broker = broker
+
+    def select_action(self, state, legal_actions: List[int]) -> int:
+        mask = np.zeros(max(legal_actions) + 1, dtype=bool)
+        mask[legal_actions] = True
+        observation = state.observation_planes(state._current_player).ravel()
+        return self._broker.submit(observation, mask).result()
+
+
+def play_concurrent_games(broker: InferenceBroker, num_games: int, max_turns: int = 200) -> List[Optional[int]]:
+    """Play games on one thread each, with every seat served by the broker
+
+    Returns:
+        Winner of each game, or None if it did not finish
+    """
+    policy = BrokeredPolicy(broker)
+
+    def play_one(_: int) -> Optional[int]:
+        return ICBMGameDriver(policies=[policy, policy]).play(max_turns)
+
+    with ThreadPoolExecutor(max_workers=num_games) as executor:
+        return list(executor.map(play_one, range(num_games)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play concurrent games against a batched NumPy policy")
+    parser.add_argument("--games", type=int, default=32)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--max-latency", type=float, default=0.005, help="Seconds a request may wait for a batch")
+    parser.add_argument("--max-turns", type=int, default=200)
+    args = parser.parse_args()
+
+    observation_size = ICBMGameDriver().state.observation_planes(0).size
+    network = MLPPolicyNetwork(observation_size)
+
+    start = time.monotonic()
+    with InferenceBroker(network, max_batch_size=args.batch_size, max_latency=args.max_latency) as broker:
+        winners = play_concurrent_games(broker, args.games, args.max_turns)
+    elapsed = time.monotonic() - start
+
+    metrics = broker.metrics
+    print(f"{len(winners)} games in {elapsed:.1f}s, {metrics.requests} requests in {metrics.batches} batches")
+    print(f"Batch fill {metrics.mean_batch_fill:.0%} (mean size {metrics.mean_batch_size:.1f} of {args.batch_size})")
+    print(f"Queue latency mean {metrics.mean_queue_latency * 1e3:.2f}ms, p95 {metrics.p95_queue_latency * 1e3:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+import json
+import math
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from policy import Policy
+
+
+@dataclass
+class GameRecord:
+    """Result of one game between policy A and policy B"""
+
+    seed: int
+    a_seat: int  # Player index policy A played as
+    winner: Optional[int]  # 0 if A won, 1 if B won, None for a draw or unfinished game
+    margin: int  # A's victory points minus B's at the end of the game
+
+
+# Plays one game: (policy_a, policy_b, seed, a_seat) -> GameRecord. Must be picklable for worker processes
+PlayFn = Callable[[Policy, Policy, int, int], GameRecord]
+
+
+@dataclass
+class PairingStats:
+    """Running totals for one pairing, from policy A's point of view"""
+
+    policy_a: str
+    policy_b: str
+    wins: int = 0
+    losses: int = 0
+    draws: int = 0
+    margin_total: int = 0
+    llr: float = 0.0
+    decision: Optional[str] = None  # "A stronger", "not stronger" or None while undecided
+
+    @property
+    def games(self) -> int:
+        return self.wins + self.losses + self.draws
+
+    @property
+    def mean_margin(self) -> float:
+        return self.margin_total / self.games if self.games else 0.0
+
+    def add(self, record: GameRecord) -> None:
+        if record.winner == 0:
+            self.wins += 1
+        elif record.winner == 1:
+            self.losses += 1
+        else:
+            self.draws += 1
+        self.margin_total += record.margin
+
+
+@dataclass
+class SPRT:
+    """Sequential probability ratio test on A's win rate over decisive games
+
+    H0: A wins with probability p0, H1: A wins with probability p1. Draws carry no information
+    and are ignored.
+    """
+
+    p0: float = 0.5
+    p1: float = 0.55
+    alpha: float = 0.05
+    beta: float = 0.05
+
+    @property
+    def upper_bound(self) -> float:
+        """LLR at or above which H1 is accepted"""
+        return math.log((1 - self.beta) / self.alpha)
+
+    @property
+    def lower_bound(self) -> float:
+        """LLR at or below which H0 is accepted"""
+        return math.log(self.beta / (1 - self.alpha))
+
+    def llr(self, wins: int, losses: int) -> float:
+        """Log-likelihood ratio of H1 against H0"""
+        return wins * math.log(self.p1 / self.p0) + losses * math.log((1 - self.p1) / (1 - self.p0))
+
+    def decide(self, stats: PairingStats) -> None:
+        """Update the pairing's LLR and record a decision once either bound is crossed"""
+        stats.llr = self.llr(stats.wins, stats.losses)
+        if stats.llr >= self.upper_bound:
+            stats.decision = "A stronger"
+        elif stats.llr <= self.lower_bound:
+            stats.decision = "not stronger"
+
+
+class ResultCache:
+    """Game results keyed by game settings, policy versions, seed and seats, stored as JSON lines"""
+
+    def __init__(self, path: Optional[Path] = None):
+        self._path = path
+        self._records: Dict[str, GameRecord] = {}
+        if path is not None and path.exists():
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    entry = json.loads(line)
+                    self._records[entry["key"]] = GameRecord(**entry["record"])
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    @staticmethod
+    def key(policy_a: Policy, policy_b: Policy, seed: int, a_seat: int, settings: str = "") -> str:
+        """Key of one game, where settings tags anything else that changes its outcome"""
+        return f"{settings}|{policy_a.key}|{policy_b.key}|{seed}|{a_seat}"
+
+    def get(self, key: str) -> Optional[GameRecord]:
+        return self._records.get(key)
+
+    def put(self, key: str, record: GameRecord) -> None:
+        self._records[key] = record
+        if self._path is not None:
+            with open(self._path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"key": key, "record": asdict(record)}) + "\n")
+
+
+def _play_task(task: Tuple[PlayFn, Policy, Policy, int, int]) -> GameRecord:
+    play_fn, *args = task
+    return play_fn(*args)
+
+
+class Tournament:
+    """Runs matches between policies across worker processes, stopping each pairing early once
+    the SPRT reaches a decision.
+
+    Game n of a pairing uses seed base_seed + n // 2, with policy A in seat n % 2, so every seed is
+    played from both seats. Results are applied in game order whatever order workers finish in, so
+    the totals and stopping point depend only on the policy versions and base_seed.
+    """
+
+    def __init__(
+        self,
+        play_fn: PlayFn,
+        workers: int = os.cpu_count() or 1,
+        sprt: Optional[SPRT] = None,
+        max_games: int = 1000,
+        base_seed: int = 0,
+        cache: Optional[ResultCache] = None,
+        settings: str = "",
+    ):
+        """
+        Args:
+            play_fn: Plays one game, must be picklable for worker processes
+            workers: Number of worker processes
+            sprt: Stopping rule applied to every pairing
+            max_games: Game limit per pairing
+            base_seed: Seed of each pairing's first pair of games
+            cache: Results to reuse and to add new games to
+            settings: Tag of the game settings play_fn uses, such as its turn limit, so cached
+                results are only reused for games played the same way
+        """
+        self.play_fn = play_fn
+        self.workers = workers
+        self.sprt = sprt or SPRT()
+        self.max_games = max_games
+        self.base_seed = base_seed
+        self.cache = cache if cache is not None else ResultCache()
+        self.settings = settings
+
+    def round_robin(self, policies: Sequence[Policy]) -> List[PairingStats]:
+        """Play every policy against every other one"""
+        pairings = [(a, b) for i, a in enumerate(policies) for b in policies[i + 1 :]]
+        return self.run(pairings)
+
+    def gauntlet(self, candidate: Policy, opponents: Sequence[Policy]) -> List[PairingStats]:
+        """Play a candidate against each opponent"""
+        return self.run([(candidate, opponent) for opponent in opponents])
+
+    def run(self, pairings: Sequence[Tuple[Policy, Policy]]) -> List[PairingStats]:
+        """Play all pairings concurrently, streaming results into their stats as games finish"""
+        stats = [PairingStats(a.key, b.key) for a, b in pairings]
+        next_game = [0] * len(pairings)  # Next game to schedule per pairing
+        next_applied = [0] * len(pairings)  # Next game to apply to the stats per pairing
+        completed: List[Dict[int, GameRecord]] = [{} for _ in pairings]  # Finished but not yet applied
+
+        def is_open(idx: int) -> bool:
+            return stats[idx].decision is None and next_game[idx] < self.max_games
+
+        def record(idx: int, game: int, result: GameRecord) -> None:
+            # Apply results strictly in game order, so the SPRT stops at the same game every run
+            completed[idx][game] = result
+            while stats[idx].decision is None and next_applied[idx] in completed[idx]:
+                stats[idx].add(completed[idx].pop(next_applied[idx]))
+                self.sprt.decide(stats[idx])
+                next_applied[idx] += 1
+
+        def tasks() -> Iterator[Tuple[int, int, str, Tuple[PlayFn, Policy, Policy, int, int]]]:
+            # Interleave pairings so they all make progress
+            while any(is_open(idx) for idx in range(len(pairings))):
+                for idx, (policy_a, policy_b) in enumerate(pairings):
+                    if not is_open(idx):
+                        continue
+                    game = next_game[idx]
+                    next_game[idx] += 1
+                    seed, a_seat = self.base_seed + game // 2, game % 2
+
+                    key = ResultCache.key(policy_a, policy_b, seed, a_seat, self.settings)
+                    cached = self.cache.get(key)
+                    if cached is not None:
+                        record(idx, game, cached)
+                        continue
+                    yield idx, game, key, (self.play_fn, policy_a, policy_b, seed, a_seat)
+
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            pending: Dict[Future, Tuple[int, int, str]] = {}
+            task_iter = tasks()
+
+            def fill() -> None:
+                # Keep a small backlog per worker so early stopping wastes little work
+                while len(pending) < 2 * self.workers:
+                    task = next(task_iter, None)
+                    if task is None:
+                        return
+                    idx, game, key, args = task
+                    pending[executor.submit(_play_task, args)] = (idx, game, key)
+
+            fill()
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    idx, game, key = pending.pop(future)
+                    result = future.result()
+                    self.cache.put(key, result)
+                    record(idx, game, result)
+
+                # Drop queued games of pairings that have been decided
+                for future, (idx, _, _) in list(pending.items()):
+                    if stats[idx].decision is not None and future.cancel():
+                        del pending[future]
+                fill()
+
+        return stats
@@ -1,11 +1,13 @@
 from enum import Enum
 import pyspiel
-from typing import Optional, List, Tuple
+from typing import Optional, List, Sequence, Tuple
 
 from icbm_game import ICBMGame
-from asset import AssetType
+from policy import Policy
 import random
 
+MAX_TURNS = 1000
+
 
 class GamePhase(Enum):
     DEPLOYMENT = "DEPLOYMENT"
@@ -13,10 +15,15 @@ class GamePhase(Enum):
 
 
 class ICBMGameDriver:
-    def __init__(self):
+    def __init__(self, policies: Optional[Sequence[Policy]] = None):
+        """
+        Args:
+            policies: Optional policy per player. Without them the placeholder action selection is used
+        """
         self.game = pyspiel.load_game("icbm_game")
         self.state = self.game.new_initial_state()
         self.current_phase = GamePhase.DEPLOYMENT
+        self.policies = policies
 
     def run_deployment_phase(self) -> bool:
         """Run the deployment phase until complete"""
@@ -63,6 +70,7 @@ class ICBMGameDriver:
 
         # Apply action. Move asset, resolve combat, reveal any hostile assets.
         self.state.execute_turn_movements(actions)
+        self.state.reveal_visible_enemy_assets()
 
         # Deduct 5 victory points from current player for taking their turn
         self.state._victory_points[self.state._current_player] -= 5
@@ -71,84 +79,42 @@ class ICBMGameDriver:
         self.state.switch_player()
 
     def _reveal_visible_enemy_assets(self) -> None:
-        """Reveal any enemy assets that are visible to each player"""
-        if self.state.game_phase != "DEPLOYMENT":
-            # For each recorded movement
-            for policy_type, action_id in self.state._policies_this_turn:
-                # Get the asset that moved
-                asset_idx, new_pos = self.state.decode_movement(action_id)
-                moved_assets = [a for a in self.state._deployed_assets[self.state._current_player] if a.definition.is_mobile]
-                if asset_idx >= len(moved_assets):
-                    continue
-
-                moved_asset = moved_assets[asset_idx]
-                enemy_player = 1 - self.state._current_player
-
-                # Check if moved asset is now visible to any enemy static scouts
-                for enemy_asset in self.state._deployed_assets[enemy_player]:
-                    # Only check static scout assets (radars)
-                    if enemy_asset.definition.type not in (AssetType.LONG_RANGE_RADAR, AssetType.SHORT_RANGE_RADAR):
-                        continue
-
-                    # Get positions
-                    moved_x, moved_y = new_pos
-                    enemy_x, enemy_y = enemy_asset.position
-
-                    # Calculate manhattan distance
-                    distance = abs(enemy_x - moved_x) + abs(enemy_y - moved_y)
-
-                    # If we moved into radar range, we're visible
-                    if distance <= enemy_asset.definition.visibility_range:
-                        self.state._visible_assets[enemy_player].add(moved_asset)
-            return
-
-        # Start with player 0
+        """Reveal any enemy assets that are visible to each player before the first battle turn"""
+        # The initial reveal leaves player 0 to move first
         if self.state._current_player == 1:
             self.state.switch_player()
 
-        # Clear all visibility data
-        self.state._visible_assets[0].clear()
-        self.state._visible_assets[1].clear()
+        self.state.reveal_visible_enemy_assets()
 
-        # Process for first player (0), then second player (1)
-        for _ in range(2):
-            current_player = self.state._current_player
-            enemy_player = 1 - current_player  # If current is 0, enemy is 1 and vice versa
+    def play(self, max_turns: int = MAX_TURNS) -> Optional[int]:
+        """Play a whole game without printing progress
 
-            # Get current player's static scouting assets
-            scout_assets = [
-                asset
-                for asset in self.state._deployed_assets[current_player]
-                if asset.definition.type in (AssetType.LONG_RANGE_RADAR, AssetType.SHORT_RANGE_RADAR)
-            ]
+        Returns:
+            The winning player, or None if deployment failed or max_turns was reached
+        """
+        if not self.run_deployment_phase():
+            return None
 
-            # Check what each scout can see
-            for scout in scout_assets:
-                scout_x, scout_y = scout.position
-                visibility_range = scout.definition.visibility_range
+        self.state.game_phase = "BATTLE"
+        self._reveal_visible_enemy_assets()
 
-                # Check against all enemy assets
-                for enemy_asset in self.state._deployed_assets[enemy_player]:
-                    if not enemy_asset.position:
-                        continue
+        for _ in range(max_turns):
+            self.run_execution_phase()
 
-                    enemy_x, enemy_y = enemy_asset.position
-                    distance = abs(enemy_x - scout_x) + abs(enemy_y - scout_y)
+            # Check victory conditions
+            if self.state._victory_points[0] <= 0:
+                return 1
+            elif self.state._victory_points[1] <= 0:
+                return 0
 
-                    if distance <= visibility_range:
-                        self.state._visible_assets[current_player].add(enemy_asset)
-
-            # Switch to other player for next iteration
-            self.state.switch_player()
-
-        # Reset back to player 0 after we're done
-        if self.state._current_player == 1:
-            self.state.switch_player()
-
-        return True
+        return None
 
     def _get_player_action(self, legal_actions: List[int]) -> List[int]:
-        """Temporary placeholder for getting player input"""
+        """Get the current player's action from their policy, or a placeholder choice"""
+        if self.policies is not None:
+            action = self.policies[self.state._current_player].select_action(self.state, legal_actions)
+            return action if self.state.game_phase == "DEPLOYMENT" else [action]
+
         # This would be replaced by actual UI/API integration
 
         if self.state.game_phase == "DEPLOYMENT":
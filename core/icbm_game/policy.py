@@ -0,0 +1,55 @@
+import random
+from typing import Dict, List, Type
+
+
+class Policy:
+    """Chooses actions for one seat of an ICBMGameDriver.
+
+    Policies must be picklable so tournaments can ship them to worker processes. Bump version
+    whenever behaviour changes so cached tournament results are not reused.
+    """
+
+    name = "policy"
+    version = "1"
+
+    @property
+    def key(self) -> str:
+        """Identifier used to cache results, e.g. random@1"""
+        return f"{self.name}@{self.version}"
+
+    def reset(self, seed: int) -> None:
+        """Prepare for a new game"""
+
+    def select_action(self, state, legal_actions: List[int]) -> int:
+        """Pick one of the legal actions for the player to move in state"""
+        raise NotImplementedError
+
+
+class RandomPolicy(Policy):
+    """Picks uniformly among legal actions"""
+
+    name = "random"
+
+    def __init__(self, seed: int = 0):
+        self._rng = random.Random(seed)
+
+    def reset(self, seed: int) -> None:
+        self._rng.seed(seed)
+
+    def select_action(self, state, legal_actions: List[int]) -> int:
+        return self._rng.choice(legal_actions)
+
+
+class FirstLegalPolicy(Policy):
+    """Always picks the first legal action"""
+
+    name = "first_legal"
+
+    def select_action(self, state, legal_actions: List[int]) -> int:
+        return legal_actions[0]
+
+
+POLICIES: Dict[str, Type[Policy]] = {
+    RandomPolicy.name: RandomPolicy,
+    FirstLegalPolicy.name: FirstLegalPolicy,
+}
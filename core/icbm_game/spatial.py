@@ -0,0 +1,89 @@
+from enum import Enum
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from asset import Asset, AssetCategory
+
+
+class HeatLayer(Enum):
+    THREAT = "THREAT"  # Cells a player's offensive assets can reach this turn (speed)
+    STRIKE = "STRIKE"  # Cells within the total range of a player's offensive assets
+    DEFENSE = "DEFENSE"  # Cells a player's interceptors can reach this turn (speed)
+    COVERAGE = "COVERAGE"  # Cells within visibility range of a player's scouts
+
+
+def build_distance_table(num_rows: int, num_cols: int) -> np.ndarray:
+    """Manhattan distance between every pair of cells, indexed as [row1, col1, row2, col2]"""
+    rows = np.arange(num_rows)
+    cols = np.arange(num_cols)
+    row_dist = np.abs(rows[:, None] - rows[None, :])
+    col_dist = np.abs(cols[:, None] - cols[None, :])
+    return row_dist[:, None, :, None] + col_dist[None, :, None, :]
+
+
+def layer_radius(asset: Asset, layer: HeatLayer) -> Optional[int]:
+    """Radius an asset covers on a heat layer, or None if it doesn't contribute"""
+    definition = asset.definition
+    if asset.is_destroyed or asset.position is None:
+        return None
+
+    if layer == HeatLayer.THREAT and definition.category == AssetCategory.OFFENSIVE:
+        radius = definition.speed
+    elif layer == HeatLayer.STRIKE and definition.category == AssetCategory.OFFENSIVE:
+        radius = definition.range
+    elif layer == HeatLayer.DEFENSE and definition.category == AssetCategory.DEFENSIVE:
+        radius = definition.speed
+    elif layer == HeatLayer.COVERAGE and (asset.is_active or not definition.is_mobile):
+        # Mobile scouts have no visibility until launched
+        radius = definition.visibility_range
+    else:
+        return None
+
+    return radius if radius > 0 else None
+
+
+class HeatMaps:
+    """Per-player threat and coverage heatmaps, updated incrementally as assets change.
+
+    Each cell counts how many of a player's assets cover it on a layer. Call update() whenever an
+    asset is deployed, moves, is launched or is destroyed; only that asset's contribution is redone.
+    """
+
+    def __init__(self, distances: np.ndarray, num_players: int = 2):
+        self._distances = distances
+        num_rows, num_cols = distances.shape[:2]
+        self._counts = np.zeros((len(HeatLayer), num_players, num_rows, num_cols), dtype=np.int32)
+
+        # Asset -> list of (layer index, position, radius) currently added to the counts
+        self._contributions: Dict[Asset, List[Tuple[int, Tuple[int, int], int]]] = {}
+
+    def _apply(self, player: int, contributions: List[Tuple[int, Tuple[int, int], int]], sign: int) -> None:
+        for layer_idx, (row, col), radius in contributions:
+            self._counts[layer_idx, player] += sign * (self._distances[row, col] <= radius)
+
+    def update(self, asset: Asset) -> None:
+        """Recompute a single asset's contribution from its current position and status"""
+        self._apply(asset.player, self._contributions.pop(asset, []), -1)
+
+        contributions = []
+        for layer_idx, layer in enumerate(HeatLayer):
+            radius = layer_radius(asset, layer)
+            if radius is not None:
+                contributions.append((layer_idx, asset.position, radius))
+
+        if contributions:
+            self._apply(asset.player, contributions, 1)
+            self._contributions[asset] = contributions
+
+    def heatmap(self, layer: HeatLayer, player: int) -> np.ndarray:
+        """Read-only (rows, cols) counts of the given player's assets covering each cell"""
+        view = self._counts[list(HeatLayer).index(layer), player]
+        view.flags.writeable = False
+        return view
+
+    def stacked(self, player: int) -> np.ndarray:
+        """Read-only (len(HeatLayer), rows, cols) array of all of a player's layers"""
+        view = self._counts[:, player]
+        view.flags.writeable = False
+        return view
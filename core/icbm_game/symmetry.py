@@ -0,0 +1,157 @@
+from dataclasses import dataclass
+from typing import List, Tuple
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class Symmetry:
+    """One orientation of the board.
+
+    Flipping the rows maps the board onto itself, and mirroring the columns swaps the two
+    players' deployment areas, so a position for player 1 mirrors one for player 0.
+    """
+
+    flip_rows: bool = False
+    mirror_players: bool = False
+
+    @property
+    def inverse(self) -> "Symmetry":
+        """Symmetry that undoes this one"""
+        # Both flips are involutions and commute, so every symmetry is its own inverse
+        return self
+
+    def transform_position(self, position: Tuple[int, int], num_rows: int, num_cols: int) -> Tuple[int, int]:
+        """Map a (row, col) position on a num_rows x num_cols grid into this orientation"""
+        row, col = position
+        if self.flip_rows:
+            row = num_rows - 1 - row
+        if self.mirror_players:
+            col = num_cols - 1 - col
+        return row, col
+
+    def transform_action(self, action_id: int, num_rows: int, area_cols: int) -> int:
+        """Map an action id into this orientation
+
+        Deployment and movement actions are both encoded as
+        block * (num_rows * area_cols) + row * area_cols + col, where area_cols is the width of the
+        player's deployment area during deployment and the full board width afterwards.
+        """
+        positions_per_block = num_rows * area_cols
+        block, position_idx = divmod(action_id, positions_per_block)
+        row, col = self.transform_position(divmod(position_idx, area_cols), num_rows, area_cols)
+        return block * positions_per_block + row * area_cols + col
+
+
+# Identity first, so variant 0 of an augmented batch is always the original data
+ALL_SYMMETRIES = [
+    Symmetry(flip_rows=False, mirror_players=False),
+    Symmetry(flip_rows=True, mirror_players=False),
+    Symmetry(flip_rows=False, mirror_players=True),
+    Symmetry(flip_rows=True, mirror_players=True),
+]
+
+
+@dataclass(frozen=True)
+class CanonicalState:
+    """A state mapped to its canonical orientation.
+
+    Equivalent states share the same key, so it can index transposition tables and replay buffers.
+    Actions are translated with to_canonical_action/from_canonical_action.
+    """
+
+    key: tuple
+    symmetry: Symmetry
+    num_rows: int
+    area_cols: int
+
+    def to_canonical_action(self, action_id: int) -> int:
+        """Map an action of the original state into the canonical orientation"""
+        return self.symmetry.transform_action(action_id, self.num_rows, self.area_cols)
+
+    def from_canonical_action(self, action_id: int) -> int:
+        """Map an action in the canonical orientation back onto the original state"""
+        return self.symmetry.inverse.transform_action(action_id, self.num_rows, self.area_cols)
+
+
+def _action_area_cols(state) -> int:
+    """Width of the position grid used by the state's action encoding"""
+    num_cols = state._board.shape[1]
+    return num_cols // 2 if state.game_phase == "DEPLOYMENT" else num_cols
+
+
+def _state_key(state, symmetry: Symmetry) -> tuple:
+    """Hashable description of the state as seen through the given symmetry
+
+    Players are listed starting with the player to move, so mirrored positions for either player
+    produce the same key.
+    """
+    num_rows, num_cols = state._board.shape
+    current_player = state._current_player
+
+    player_keys = []
+    for player in (current_player, 1 - current_player):
+        enemy_index = {id(asset): idx for idx, asset in enumerate(state._deployed_assets[1 - player])}
+        deployed = tuple(
+            (
+                asset.definition.type.value,
+                symmetry.transform_position(asset.position, num_rows, num_cols),
+                asset.is_active,
+                asset.is_destroyed,
+            )
+            for asset in state._deployed_assets[player]
+        )
+        player_keys.append(
+            (
+                state._players_points[player],
+                state._victory_points[player],
+                state._has_citadel[player],
+                tuple(asset.definition.type.value for asset in state._purchased_assets[player]),
+                deployed,
+                tuple(sorted(enemy_index[id(asset)] for asset in state._visible_assets[player])),
+            )
+        )
+
+    return (state.game_phase, state._turn_number, tuple(player_keys))
+
+
+def canonicalize(state) -> CanonicalState:
+    """Map an ICBMState to its canonical orientation
+
+    The player to move is always mirrored onto player 0's half of the board, then the row flip is
+    chosen that gives the smallest key.
+    """
+    num_rows = state._board.shape[0]
+    mirror_players = state._current_player == 1
+
+    candidates = [symmetry for symmetry in ALL_SYMMETRIES if symmetry.mirror_players == mirror_players]
+    key, symmetry = min(((_state_key(state, symmetry), symmetry) for symmetry in candidates), key=lambda c: c[0])
+
+    return CanonicalState(key=key, symmetry=symmetry, num_rows=num_rows, area_cols=_action_area_cols(state))
+
+
+def augment_batch(observations: np.ndarray, masks: np.ndarray, area_cols: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Emit every symmetric variant of a batch of observations and legal-action masks
+
+    Args:
+        observations: (batch, channels, rows, cols) observation planes, e.g. from observation_planes
+        masks: (batch, num_actions) legal-action masks, num_actions a multiple of rows * area_cols
+        area_cols: Width of the action position grid, half the board during deployment and the
+            full board afterwards
+
+    Returns:
+        Observations of shape (len(ALL_SYMMETRIES), batch, channels, rows, cols) and masks of shape
+        (len(ALL_SYMMETRIES), batch, num_actions), with variants ordered as ALL_SYMMETRIES
+    """
+    batch, _, num_rows, _ = observations.shape
+    grid_masks = masks.reshape(batch, -1, num_rows, area_cols)
+
+    observation_variants: List[np.ndarray] = []
+    mask_variants: List[np.ndarray] = []
+    for symmetry in ALL_SYMMETRIES:
+        # Rows and columns are the last two axes of both the planes and the reshaped masks
+        axes = tuple(axis for axis, flip in ((-2, symmetry.flip_rows), (-1, symmetry.mirror_players)) if flip)
+        observation_variants.append(np.flip(observations, axis=axes))
+        mask_variants.append(np.flip(grid_masks, axis=axes).reshape(batch, -1))
+
+    return np.stack(observation_variants), np.stack(mask_variants)
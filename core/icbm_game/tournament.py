@@ -0,0 +1,68 @@
+import argparse
+import functools
+import os
+import random
+from pathlib import Path
+
+from matches import GameRecord, ResultCache, Tournament
+from play_game import ICBMGameDriver, MAX_TURNS
+from policy import POLICIES, Policy
+
+
+def play_match(policy_a: Policy, policy_b: Policy, seed: int, a_seat: int, max_turns: int = MAX_TURNS) -> GameRecord:
+    """Play one game with policy A in the given seat"""
+    # The driver's placeholder paths draw from the global generator
+    random.seed(seed)
+
+    seats = [policy_a, policy_b] if a_seat == 0 else [policy_b, policy_a]
+    for player, policy in enumerate(seats):
+        # Seeding by seat keeps both games of a seat-swapped pair on the same random streams
+        policy.reset(seed * 2 + player)
+
+    driver = ICBMGameDriver(policies=seats)
+    winner = driver.play(max_turns)
+
+    victory_points = driver.state._victory_points
+    return GameRecord(
+        seed=seed,
+        a_seat=a_seat,
+        winner=None if winner is None else int(winner != a_seat),
+        margin=victory_points[a_seat] - victory_points[1 - a_seat],
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a bot tournament")
+    parser.add_argument("policies", nargs="+", choices=sorted(POLICIES), help="Policies to play")
+    parser.add_argument("--candidate", choices=sorted(POLICIES), help="Run a gauntlet for this policy instead")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--max-games", type=int, default=1000, help="Game limit per pairing")
+    parser.add_argument("--seed", type=int, default=0, help="Base seed")
+    parser.add_argument("--cache", type=Path, help="JSON lines file of cached results")
+    parser.add_argument("--max-turns", type=int, default=MAX_TURNS, help="Turn limit per game")
+    args = parser.parse_args()
+
+    tournament = Tournament(
+        functools.partial(play_match, max_turns=args.max_turns),
+        workers=args.workers,
+        max_games=args.max_games,
+        base_seed=args.seed,
+        cache=ResultCache(args.cache),
+        settings=f"max_turns={args.max_turns}",
+    )
+    policies = [POLICIES[name]() for name in args.policies]
+    if args.candidate:
+        results = tournament.gauntlet(POLICIES[args.candidate](), policies)
+    else:
+        results = tournament.round_robin(policies)
+
+    for stats in results:
+        print(
+            f"{stats.policy_a} vs {stats.policy_b}: {stats.wins}W {stats.losses}L {stats.draws}D "
+            f"in {stats.games} games, mean margin {stats.mean_margin:+.1f}, LLR {stats.llr:.2f}, "
+            f"{stats.decision or 'undecided'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+import threading
+import time
+import unittest
+import numpy as np
+from icbm_game.broker import InferenceBroker
+
+
+def _rising_logits(observations, num_actions):
+    """Prefers higher action ids, so only the mask keeps the argmax legal"""
+    return np.tile(np.arange(num_actions, dtype=np.float32), (len(observations), 1))
+
+
+def _failing_policy(observations, num_actions):
+    raise ValueError("policy failed")
+
+
+def _mask(size, legal):
+    mask = np.zeros(size, dtype=bool)
+    mask[legal] = True
+    return mask
+
+
+class TestInferenceBroker(unittest.TestCase):
+    def setUp(self):
+        self.observation = np.zeros(4, dtype=np.float32)
+
+    def test_full_batch_dispatches_immediately(self):
+        with InferenceBroker(_rising_logits, max_batch_size=4, max_latency=10.0) as broker:
+            futures = [broker.submit(self.observation, _mask(3, [0, 1])) for _ in range(4)]
+            self.assertEqual([future.result(timeout=1.0) for future in futures], [1, 1, 1, 1])
+        self.assertEqual(broker.metrics.batches, 1)
+        self.assertEqual(broker.metrics.mean_batch_fill, 1.0)
+
+    def test_single_request_waits_for_max_latency(self):
+        with InferenceBroker(_rising_logits, max_batch_size=4, max_latency=0.1) as broker:
+            submitted = time.monotonic()
+            future = broker.submit(self.observation, _mask(2, [0]))
+            self.assertFalse(future.done())
+            self.assertEqual(future.result(timeout=1.0), 0)
+            self.assertGreaterEqual(time.monotonic() - submitted, 0.1)
+        self.assertEqual(broker.metrics.mean_batch_size, 1.0)
+
+    def test_masks_of_different_lengths(self):
+        widths = []
+
+        def policy_fn(observations, num_actions):
+            widths.append(num_actions)
+            return _rising_logits(observations, num_actions)
+
+        with InferenceBroker(policy_fn, max_batch_size=2, max_latency=10.0) as broker:
+            short = broker.submit(self.observation, _mask(3, [0]))
+            long = broker.submit(self.observation, _mask(6, [1, 3]))
+            self.assertEqual((short.result(timeout=1.0), long.result(timeout=1.0)), (0, 3))
+        self.assertEqual(widths, [6])
+
+        with InferenceBroker(_rising_logits, max_batch_size=2, max_latency=10.0, temperature=5.0) as broker:
+            for _ in range(50):
+                short = broker.submit(self.observation, _mask(3, [0, 2]))
+                long = broker.submit(self.observation, _mask(6, [1, 4]))
+                self.assertIn(short.result(timeout=1.0), (0, 2))
+                self.assertIn(long.result(timeout=1.0), (1, 4))
+
+    def test_policy_exception_reaches_every_future(self):
+        with InferenceBroker(_failing_policy, max_batch_size=3, max_latency=10.0) as broker:
+            futures = [broker.submit(self.observation, _mask(2, [0, 1])) for _ in range(3)]
+            for future in futures:
+                self.assertIsInstance(future.exception(timeout=1.0), ValueError)
+
+            # The broker keeps serving after a failed batch
+            broker.policy_fn = _rising_logits
+            futures = [broker.submit(self.observation, _mask(2, [0, 1])) for _ in range(3)]
+            self.assertEqual([future.result(timeout=1.0) for future in futures], [1, 1, 1])
+
+    def test_cancelled_request_is_dropped(self):
+        with InferenceBroker(_rising_logits, max_batch_size=2, max_latency=10.0) as broker:
+            cancelled = broker.submit(self.observation, _mask(2, [0]))
+            self.assertTrue(cancelled.cancel())
+
+            # The cancelled request fills the batch but is not evaluated, and serving carries on
+            first = broker.submit(self.observation, _mask(2, [0, 1]))
+            self.assertEqual(first.result(timeout=1.0), 1)
+            later = [broker.submit(self.observation, _mask(3, [0, 2])) for _ in range(2)]
+            self.assertEqual([future.result(timeout=1.0) for future in later], [2, 2])
+        self.assertTrue(cancelled.cancelled())
+        self.assertEqual(broker.metrics.requests, 3)
+
+    def test_stop_drains_queue(self):
+        broker = InferenceBroker(_rising_logits, max_batch_size=8, max_latency=10.0)
+        broker.start()
+        futures = [broker.submit(self.observation, _mask(2, [0])) for _ in range(3)]
+        broker.stop()
+
+        self.assertTrue(all(future.done() for future in futures))
+        self.assertEqual([future.result() for future in futures], [0, 0, 0])
+        with self.assertRaises(RuntimeError):
+            broker.submit(self.observation, _mask(2, [0]))
+
+    def test_start_twice(self):
+        broker = InferenceBroker(_rising_logits)
+        broker.start()
+        broker.start()
+        serving = [thread for thread in threading.enumerate() if thread.name == "inference-broker"]
+        self.assertEqual(len(serving), 1)
+
+        broker.stop()
+        self.assertFalse(any(thread.name == "inference-broker" for thread in threading.enumerate()))
+
+
+if __name__ == "__main__":
+    unittest.main()
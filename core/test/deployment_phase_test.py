@@ -1,3 +1,4 @@
+import random
 import unittest
 import pyspiel
 from icbm_game.icbm_game import (
@@ -5,6 +6,8 @@ from icbm_game.icbm_game import (
     AssetType,
     _NUM_ROWS,
     _NUM_COLS,
+    _STARTING_POINTS,
+    _build_budget_reachability,
 )
 
 
@@ -87,5 +90,44 @@ class TestICBMGameDeployment(unittest.TestCase):
         self.assertEqual(p2_citadel.position, (0, 10))
 
 
+class TestDeploymentBudget(unittest.TestCase):
+    def setUp(self):
+        self.game = pyspiel.load_game("icbm_game")
+        self.state = self.game.new_initial_state()
+
+    def _run_random_deployment(self, seed: int) -> None:
+        rng = random.Random(seed)
+        for player in range(2):
+            while not self.state.is_deployment_done(player):
+                legal_actions = self.state._legal_actions(player)
+                self.assertTrue(legal_actions, "Deployment dead-ended")
+                self.state.apply_action(rng.choice(legal_actions))
+            self.state.switch_player()
+
+    def test_reachability_table(self):
+        reachable = self.game.budget_reachability
+        self.assertEqual(reachable.shape, (2, _STARTING_POINTS + 1))
+        self.assertTrue(reachable[0, _STARTING_POINTS])
+
+        # Artillery costs 1, so any remainder can be spent once a launch site exists
+        self.assertTrue(reachable[1].all())
+
+        # Without a launch site only static assets are available, all priced in multiples of 5
+        self.assertFalse(reachable[0, 3])
+        self.assertTrue(reachable[0, 10])
+
+    def test_unreachable_purchases_are_pruned(self):
+        for seed in range(20):
+            # With artillery at 2 points, a remainder of 1 can never be spent
+            self.state = self.game.new_initial_state()
+            self.state.assets[AssetType.ARTILLERY].cost = 2
+            self.state._budget_reachability = _build_budget_reachability(self.state.assets, _STARTING_POINTS)
+            self.assertFalse(self.state._budget_reachability[1, 1])
+
+            self._run_random_deployment(seed)
+            self.assertTrue(self.state.is_deployment_done(0))
+            self.assertTrue(self.state.is_deployment_done(1))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,28 @@
+import unittest
+from icbm_game.icbm_game import ICBMGame
+from icbm_game.fuzz import Fuzzer, shrink_actions
+
+
+class TestFuzz(unittest.TestCase):
+    def test_engines_agree(self):
+        fuzzer = Fuzzer()
+        for seed in range(3):
+            result = fuzzer.play(seed)
+            self.assertIsNone(result.divergence, result.divergence and result.divergence.message)
+            self.assertGreater(result.steps, 0)
+
+    def test_reference_mode_is_a_game_parameter(self):
+        fuzzer = Fuzzer()
+        self.assertTrue(fuzzer.reference_game.new_initial_state()._reference_mode)
+        self.assertFalse(fuzzer.fast_game.new_initial_state()._reference_mode)
+
+    def test_shrink_actions(self):
+        # Fails whenever both 3 and 7 are present, with 3 first
+        def fails(actions):
+            return 3 in actions and 7 in actions and actions.index(3) < actions.index(7)
+
+        self.assertEqual(shrink_actions(list(range(20)), fails), [3, 7])
+
+
+if __name__ == "__main__":
+    unittest.main()
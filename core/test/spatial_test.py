@@ -0,0 +1,84 @@
+import unittest
+import numpy as np
+import pyspiel
+from icbm_game.icbm_game import (
+    ICBMGame,
+    AssetType,
+    _NUM_ROWS,
+    _NUM_COLS,
+    HeatLayer,
+    HeatMaps,
+    build_distance_table,
+)
+
+
+class TestSpatial(unittest.TestCase):
+    def setUp(self):
+        self.game = pyspiel.load_game("icbm_game")
+        self.state = self.game.new_initial_state()
+
+    def _deploy(self, player: int, asset_type: AssetType, position):
+        self.assertTrue(self.state.purchase_asset(player, asset_type))
+        self.assertTrue(self.state.deploy_asset(player, -1, position))
+        return self.state._deployed_assets[player][-1]
+
+    def _rebuilt_heatmaps(self) -> HeatMaps:
+        heatmaps = HeatMaps(self.state._distances)
+        for player in range(2):
+            for asset in self.state._deployed_assets[player]:
+                heatmaps.update(asset)
+        return heatmaps
+
+    def test_distance_table(self):
+        distances = build_distance_table(_NUM_ROWS, _NUM_COLS)
+        self.assertEqual(distances.shape, (_NUM_ROWS, _NUM_COLS, _NUM_ROWS, _NUM_COLS))
+        for r1, c1, r2, c2 in [(0, 0, 9, 19), (3, 4, 3, 4), (5, 2, 1, 7)]:
+            self.assertEqual(distances[r1, c1, r2, c2], abs(r1 - r2) + abs(c1 - c2))
+
+    def test_legal_movements_within_speed(self):
+        self._deploy(0, AssetType.LAUNCH_SITE, (4, 3))
+        icbm = self._deploy(0, AssetType.ICBM, (4, 3))
+
+        legal = self.state._legal_movements(0)
+        expected = [
+            row * _NUM_COLS + col
+            for row in range(_NUM_ROWS)
+            for col in range(_NUM_COLS)
+            if abs(row - 4) + abs(col - 3) <= icbm.definition.speed
+        ]
+        self.assertEqual(legal, expected)
+
+    def test_heatmaps_update_incrementally(self):
+        self._deploy(0, AssetType.CITADEL, (0, 0))
+        self._deploy(0, AssetType.LAUNCH_SITE, (4, 3))
+        icbm = self._deploy(0, AssetType.ICBM, (4, 3))
+        self._deploy(0, AssetType.SATELLITE, (4, 3))
+        radar = self._deploy(1, AssetType.LONG_RANGE_RADAR, (5, 15))
+
+        threat = self.state.heatmap(HeatLayer.THREAT, 0)
+        self.assertEqual(threat[4, 3 + icbm.definition.speed], 1)
+        self.assertEqual(threat[4, 4 + icbm.definition.speed], 0)
+
+        # Unlaunched satellites contribute no coverage, the citadel does
+        coverage = self.state.heatmap(HeatLayer.COVERAGE, 0)
+        self.assertEqual(coverage[4, 3], 0)
+        self.assertEqual(coverage[0, 0], 1)
+
+        # Move the ICBM (first mobile asset) towards the enemy
+        self.state.execute_turn_movements([0 * _NUM_ROWS * _NUM_COLS + 4 * _NUM_COLS + 7])
+        self.assertEqual(icbm.position, (4, 7))
+        self.assertEqual(threat[4, 11], 1)
+        self.assertEqual(threat[4, 2], 0)
+
+        self.state.destroy_asset(radar)
+        self.assertFalse(self.state.heatmap(HeatLayer.COVERAGE, 1).any())
+        self.assertEqual(self.state.get_static_asset_at_position((5, 15)), None)
+
+        rebuilt = self._rebuilt_heatmaps()
+        for player in range(2):
+            for layer in HeatLayer:
+                np.testing.assert_array_equal(self.state.heatmap(layer, player), rebuilt.heatmap(layer, player))
+
+
+if __name__ == "__main__":
+    unittest.main()
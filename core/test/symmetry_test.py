@@ -0,0 +1,80 @@
+import unittest
+import numpy as np
+import pyspiel
+from icbm_game.icbm_game import (
+    ICBMGame,
+    AssetType,
+    _NUM_ROWS,
+    _NUM_COLS,
+)
+from icbm_game.symmetry import ALL_SYMMETRIES, augment_batch, canonicalize
+
+
+class TestSymmetry(unittest.TestCase):
+    def setUp(self):
+        self.game = pyspiel.load_game("icbm_game")
+
+    def _deploy(self, player: int, layout) -> pyspiel.State:
+        """Deploy (asset_type, (row, col)) pairs for a player and leave them to move"""
+        state = self.game.new_initial_state()
+        state._current_player = player
+        for asset_type, position in layout:
+            self.assertTrue(state.purchase_asset(player, asset_type))
+            self.assertTrue(state.deploy_asset(player, -1, position))
+        return state
+
+    def test_action_round_trip(self):
+        for symmetry in ALL_SYMMETRIES:
+            for area_cols in (_NUM_COLS // 2, _NUM_COLS):
+                for action_id in range(3 * _NUM_ROWS * area_cols):
+                    transformed = symmetry.transform_action(action_id, _NUM_ROWS, area_cols)
+                    self.assertEqual(symmetry.inverse.transform_action(transformed, _NUM_ROWS, area_cols), action_id)
+
+    def test_equivalent_states_share_key(self):
+        layout = [(AssetType.CITADEL, (1, 2)), (AssetType.LAUNCH_SITE, (3, 4)), (AssetType.ICBM, (3, 4))]
+        row_flipped = [(asset_type, (_NUM_ROWS - 1 - row, col)) for asset_type, (row, col) in layout]
+        mirrored = [(asset_type, (row, _NUM_COLS - 1 - col)) for asset_type, (row, col) in layout]
+
+        states = [self._deploy(0, layout), self._deploy(0, row_flipped), self._deploy(1, mirrored)]
+        canonical = [canonicalize(state) for state in states]
+        self.assertEqual(canonical[0].key, canonical[1].key)
+        self.assertEqual(canonical[0].key, canonical[2].key)
+
+        # Legal actions agree once mapped into the canonical orientation
+        canonical_legal = [
+            sorted(form.to_canonical_action(a) for a in state._legal_actions(state._current_player))
+            for state, form in zip(states, canonical)
+        ]
+        self.assertEqual(canonical_legal[0], canonical_legal[1])
+        self.assertEqual(canonical_legal[0], canonical_legal[2])
+
+        # And map back onto the original state's actions
+        for state, form in zip(states, canonical):
+            legal = state._legal_actions(state._current_player)
+            self.assertEqual(sorted(form.from_canonical_action(form.to_canonical_action(a)) for a in legal), legal)
+
+    def test_augment_batch(self):
+        state = self._deploy(0, [(AssetType.CITADEL, (1, 2)), (AssetType.LAUNCH_SITE, (3, 4))])
+        legal = state._legal_actions(0)
+        mask = np.zeros(len(AssetType) * _NUM_ROWS * (_NUM_COLS // 2), dtype=bool)
+        mask[legal] = True
+
+        observations = np.stack([state.observation_planes(0)] * 3)
+        masks = np.stack([mask] * 3)
+        aug_observations, aug_masks = augment_batch(observations, masks, _NUM_COLS // 2)
+
+        self.assertEqual(aug_observations.shape, (len(ALL_SYMMETRIES),) + observations.shape)
+        self.assertEqual(aug_masks.shape, (len(ALL_SYMMETRIES),) + masks.shape)
+        np.testing.assert_array_equal(aug_observations[0], observations)
+        np.testing.assert_array_equal(aug_masks[0], masks)
+
+        for variant, symmetry in enumerate(ALL_SYMMETRIES):
+            expected = sorted(symmetry.transform_action(a, _NUM_ROWS, _NUM_COLS // 2) for a in legal)
+            self.assertEqual(np.flatnonzero(aug_masks[variant, 1]).tolist(), expected)
+
+            row, col = symmetry.transform_position((1, 2), _NUM_ROWS, _NUM_COLS)
+            self.assertEqual(aug_observations[variant, 2, list(AssetType).index(AssetType.CITADEL), row, col], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+import math
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from icbm_game.matches import SPRT, GameRecord, PairingStats, ResultCache, Tournament
+from icbm_game.policy import Policy
+
+
+class _NamedPolicy(Policy):
+    def __init__(self, name: str, version: str = "1"):
+        self.name = name
+        self.version = version
+
+
+def _seat_game(policy_a, policy_b, seed, a_seat):
+    """A wins from seat 0 and loses from seat 1"""
+    return GameRecord(seed=seed, a_seat=a_seat, winner=a_seat, margin=10 if a_seat == 0 else -4)
+
+
+def _draw_game(policy_a, policy_b, seed, a_seat):
+    return GameRecord(seed=seed, a_seat=a_seat, winner=None, margin=0)
+
+
+def _a_wins_game(policy_a, policy_b, seed, a_seat):
+    return GameRecord(seed=seed, a_seat=a_seat, winner=0, margin=5)
+
+
+def _jittery_game(policy_a, policy_b, seed, a_seat):
+    """Mostly A wins, finishing in a seed-dependent order"""
+    time.sleep((seed * 7 % 5) * 0.002)
+    return GameRecord(seed=seed, a_seat=a_seat, winner=int(seed % 4 == 0 and a_seat == 1), margin=seed - 10)
+
+
+def _failing_game(policy_a, policy_b, seed, a_seat):
+    raise AssertionError("cached games must not be replayed")
+
+
+class TestSPRT(unittest.TestCase):
+    def test_bounds_and_llr(self):
+        sprt = SPRT(p0=0.5, p1=0.55, alpha=0.05, beta=0.05)
+        self.assertAlmostEqual(sprt.upper_bound, math.log(19))
+        self.assertAlmostEqual(sprt.lower_bound, -math.log(19))
+        self.assertAlmostEqual(sprt.llr(1, 0), math.log(1.1))
+        self.assertAlmostEqual(sprt.llr(0, 1), math.log(0.9))
+        self.assertAlmostEqual(sprt.llr(3, 3), 3 * math.log(1.1 * 0.9))
+
+    def test_decide(self):
+        sprt = SPRT(p0=0.5, p1=0.75)
+        stats = PairingStats("a@1", "b@1", wins=10)
+        sprt.decide(stats)
+        self.assertEqual(stats.decision, "A stronger")
+
+        stats = PairingStats("a@1", "b@1", losses=10)
+        sprt.decide(stats)
+        self.assertEqual(stats.decision, "not stronger")
+
+        stats = PairingStats("a@1", "b@1", wins=1, losses=1, draws=50)
+        sprt.decide(stats)
+        self.assertIsNone(stats.decision)
+
+
+class TestTournament(unittest.TestCase):
+    def setUp(self):
+        self.a = _NamedPolicy("a")
+        self.b = _NamedPolicy("b")
+        # Bounds that are never reached within the test's game limits
+        self.undecided = SPRT(alpha=1e-9, beta=1e-9)
+
+    def test_seats_alternate_and_stats_are_from_a(self):
+        cache = ResultCache()
+        tournament = Tournament(_seat_game, workers=2, sprt=self.undecided, max_games=6, base_seed=3, cache=cache)
+        (stats,) = tournament.gauntlet(self.a, [self.b])
+
+        self.assertEqual((stats.wins, stats.losses, stats.draws), (3, 3, 0))
+        self.assertEqual(stats.margin_total, 3 * 10 - 3 * 4)
+        self.assertAlmostEqual(stats.mean_margin, 3.0)
+        for seed in (3, 4, 5):
+            for a_seat in (0, 1):
+                self.assertIsNotNone(cache.get(ResultCache.key(self.a, self.b, seed, a_seat)))
+
+        (stats,) = Tournament(_draw_game, workers=1, sprt=self.undecided, max_games=4).gauntlet(self.a, [self.b])
+        self.assertEqual((stats.wins, stats.losses, stats.draws), (0, 0, 4))
+
+    def test_round_robin_pairings(self):
+        c = _NamedPolicy("c")
+        tournament = Tournament(_a_wins_game, workers=2, sprt=self.undecided, max_games=2)
+        results = tournament.round_robin([self.a, self.b, c])
+        self.assertEqual([(s.policy_a, s.policy_b) for s in results], [("a@1", "b@1"), ("a@1", "c@1"), ("b@1", "c@1")])
+
+    def test_results_apply_in_game_order(self):
+        def run(workers):
+            tournament = Tournament(_jittery_game, workers=workers, sprt=SPRT(p1=0.7), max_games=200)
+            return tournament.gauntlet(self.a, [self.b])[0]
+
+        expected = run(1)
+        self.assertEqual(expected.decision, "A stronger")
+        for _ in range(3):
+            self.assertEqual(run(4), expected)
+
+    def test_decision_cancels_queued_games(self):
+        sprt = SPRT(p1=0.75)
+        cache = ResultCache()
+        (stats,) = Tournament(_a_wins_game, workers=2, sprt=sprt, max_games=1000, cache=cache).gauntlet(
+            self.a, [self.b]
+        )
+
+        self.assertEqual(stats.decision, "A stronger")
+        self.assertEqual(stats.games, math.ceil(sprt.upper_bound / math.log(sprt.p1 / sprt.p0)))
+        # Only the small per-worker backlog runs past the decision
+        self.assertLessEqual(len(cache), stats.games + 2 * 2)
+
+    def test_cache_round_trip_and_rerun(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "results.jsonl"
+            record = GameRecord(seed=1, a_seat=1, winner=None, margin=-3)
+            ResultCache(path).put("key", record)
+            self.assertEqual(ResultCache(path).get("key"), record)
+
+            first = Tournament(_jittery_game, workers=2, sprt=SPRT(p1=0.7), cache=ResultCache(path))
+            expected = first.gauntlet(self.a, [self.b])[0]
+
+            # Every game needed is cached, so the rerun plays nothing and stops at the same point
+            rerun = Tournament(_failing_game, workers=2, sprt=SPRT(p1=0.7), cache=ResultCache(path))
+            self.assertEqual(rerun.gauntlet(self.a, [self.b])[0], expected)
+
+    def test_changed_settings_miss_cache(self):
+        cache = ResultCache()
+        short = Tournament(_draw_game, workers=1, sprt=self.undecided, max_games=4, cache=cache, settings="max_turns=5")
+        short.gauntlet(self.a, [self.b])
+
+        # Games cut short under other settings are replayed rather than reused
+        tournament = Tournament(
+            _a_wins_game, workers=1, sprt=self.undecided, max_games=4, cache=cache, settings="max_turns=1000"
+        )
+        (stats,) = tournament.gauntlet(self.a, [self.b])
+        self.assertEqual((stats.wins, stats.draws), (4, 0))
+        self.assertEqual(len(cache), 8)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+import pyspiel
+from icbm_game.icbm_game import (
+    ICBMGame,
+    AssetType,
+    _NUM_ROWS,
+    _NUM_COLS,
+)
+
+
+class TestVisibility(unittest.TestCase):
+    def setUp(self):
+        self.game = pyspiel.load_game("icbm_game")
+        self.state = self.game.new_initial_state()
+
+    def _deploy(self, player: int, asset_type: AssetType, position):
+        self.assertTrue(self.state.purchase_asset(player, asset_type))
+        self.assertTrue(self.state.deploy_asset(player, -1, position))
+        return self.state._deployed_assets[player][-1]
+
+    def _move(self, player: int, asset, position) -> None:
+        mobile_assets = [
+            a for a in self.state._deployed_assets[player] if a.definition.is_mobile and not a.is_destroyed
+        ]
+        self.state._current_player = player
+        action_id = mobile_assets.index(asset) * _NUM_ROWS * _NUM_COLS + position[0] * _NUM_COLS + position[1]
+        self.assertTrue(self.state.execute_movement(action_id))
+        self.state.reveal_visible_enemy_assets()
+
+    def _start_battle(self) -> None:
+        self.state.reveal_visible_enemy_assets()
+        self.state.game_phase = "BATTLE"
+
+    def test_moves_invalidate_and_reveal(self):
+        radar = self._deploy(1, AssetType.SHORT_RANGE_RADAR, (5, 11))
+        self._deploy(0, AssetType.LAUNCH_SITE, (5, 2))
+        icbm = self._deploy(0, AssetType.ICBM, (5, 2))
+        self._start_battle()
+        self.assertEqual(self.state._visible_assets[1], set())
+
+        # Moving into radar range reveals the asset
+        self._move(0, icbm, (5, 6))
+        self._move(0, icbm, (5, 9))
+        self.assertIn(icbm, self.state._visible_assets[1])
+        self.assertEqual(self.state._observers[icbm], {radar})
+        self.assertEqual(self.state._sightings[radar], {icbm})
+
+        # Moving again drops it until it is seen at the new position
+        self._move(0, icbm, (1, 9))
+        self.assertNotIn(icbm, self.state._visible_assets[1])
+        self.assertEqual(self.state._sightings[radar], set())
+
+    def test_mobile_scouts_see_once_launched(self):
+        self._deploy(0, AssetType.LAUNCH_SITE, (5, 9))
+        satellite = self._deploy(0, AssetType.SATELLITE, (5, 9))
+        citadel = self._deploy(1, AssetType.CITADEL, (5, 11))
+        self._start_battle()
+
+        # Within range, but satellites have no visibility until launched
+        self.assertNotIn(citadel, self.state._visible_assets[0])
+
+        self._move(0, satellite, (4, 9))
+        self.assertIn(citadel, self.state._visible_assets[0])
+
+        # Seen assets stay visible after the scout moves away, only the pair is dropped
+        self._move(0, satellite, (1, 6))
+        self.assertIn(citadel, self.state._visible_assets[0])
+        self.assertEqual(self.state._observers[citadel], set())
+
+    def test_destroyed_scouts_release_their_sightings(self):
+        radar = self._deploy(0, AssetType.LONG_RANGE_RADAR, (5, 8))
+        citadel = self._deploy(1, AssetType.CITADEL, (5, 11))
+        self._start_battle()
+        self.assertIn(citadel, self.state._visible_assets[0])
+
+        self.state.destroy_asset(radar)
+        self.assertNotIn(radar, self.state._sightings)
+        self.assertEqual(self.state._observers[citadel], set())
+        self.assertIn(citadel, self.state._visible_assets[0])
+
+        self.state.destroy_asset(citadel)
+        self.assertNotIn(citadel, self.state._visible_assets[0])
+        self.assertEqual(self.state.get_assets_at_position((5, 11)), [citadel])
+
+
+if __name__ == "__main__":
+    unittest.main()